@@ -15,6 +15,9 @@ source.dir = .
 # Extensões a incluir (inclui .onnx para modelo YOLO)
 source.include_exts = py,png,jpg,kv,atlas,wav,mp3,onnx
 
+# Código só de desenvolvimento (treino no Colab, CI) fica fora do APK
+source.exclude_dirs = training, .github
+
 # Versão
 version = 1.3.0
 
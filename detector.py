@@ -5,9 +5,10 @@ Usa YOLO treinado para detecção precisa.
 Fallback para heurísticas se modelo não disponível.
 """
 
-from typing import List, Tuple
 import os
 
+import numpy as np
+
 
 class PotholeDetector:
     """
@@ -18,12 +19,14 @@ class PotholeDetector:
     2. Heurísticas OpenCV (fallback) - BAIXA PRECISÃO
     """
 
-    def __init__(self, min_confidence: float = 0.50):
+    def __init__(self, min_confidence: float = 0.50, use_gpu: bool = False):
         """
         Args:
             min_confidence: Confiança mínima (0.0-1.0) para reportar detecção.
+            use_gpu: Tenta rodar o YOLO na GPU (OpenCL), com fallback para CPU.
         """
         self.min_confidence = min_confidence
+        self.use_gpu = use_gpu
         self._detector = None
         self._init_detector()
 
@@ -33,7 +36,8 @@ class PotholeDetector:
         try:
             from detector_yolo import YOLOPotholeDetector
             self._detector = YOLOPotholeDetector(
-                conf_threshold=0.1  # Baixo para capturar tudo, filtrar na UI
+                conf_threshold=0.1,  # Baixo para capturar tudo, filtrar na UI
+                use_gpu=self.use_gpu
             )
             if self._detector.model_loaded:
                 print("✅ Usando detector YOLO (alta precisão)")
@@ -52,29 +56,31 @@ class PotholeDetector:
             print(f"Erro ao inicializar detector: {e}")
             self._detector = None
 
-    def detect(self, frame, return_all: bool = True) -> List[Tuple[float, float, float, float, float]]:
+    def detect(self, frame, return_all: bool = True) -> np.ndarray:
         """
         Detecta buracos no frame.
 
         Args:
-            frame: Imagem BGR (formato OpenCV)
+            frame: Imagem BGR (H, W, 3) ou RGBA (H, W, 4); 4 canais são
+                sempre tratados como RGBA (leitura da GPU)
             return_all: Se True, retorna todas as detecções. Se False, filtra por min_confidence.
 
         Returns:
-            Lista de tuplas (x, y, w, h, confidence) com coordenadas normalizadas (0-1)
+            Array (N, 5) float32 com (x, y, w, h, confidence) normalizados (0-1),
+            ordenado por confiança
         """
         if self._detector is None:
-            return []
+            return np.empty((0, 5), dtype=np.float32)
         
         try:
             detections = self._detector.detect(frame)
             if return_all:
                 return detections
             # Filtra por confiança mínima
-            return [d for d in detections if d[4] >= self.min_confidence]
+            return detections[detections[:, 4] >= self.min_confidence]
         except Exception as e:
             print(f"Erro na detecção: {e}")
-            return []
+            return np.empty((0, 5), dtype=np.float32)
 
     @property
     def active_detector(self):
@@ -88,6 +94,23 @@ class PotholeDetector:
             return "Nenhum"
         return type(self._detector).__name__
 
+    @property
+    def backend(self) -> str:
+        """Retorna onde a inferência roda (ex: 'OpenCL FP16', 'CPU')."""
+        if self._detector is None:
+            return "Nenhum"
+        return getattr(self._detector, "backend", "CPU")
+
+    @property
+    def quantized(self) -> bool:
+        """Verifica se o modelo ativo é quantizado (INT8)."""
+        return bool(getattr(self._detector, "quantized", False))
+
+    @property
+    def requires_contiguous(self) -> bool:
+        """Se o detector ativo precisa de frames contíguos (sem views com strides)."""
+        return getattr(self._detector, "requires_contiguous", True)
+
     @property
     def is_yolo_available(self) -> bool:
         """Verifica se está usando YOLO."""
@@ -20,6 +20,9 @@ class HeuristicPotholeDetector:
     - Scoring multi-critério
     """
 
+    # Só a ROI é copiada (cvtColor), então views rotacionadas servem
+    requires_contiguous = False
+
     __slots__ = [
         'min_confidence', 'min_area_ratio', 'max_area_ratio',
         'roi_y_start', '_kernel_small', '_kernel_large', '_clahe',
@@ -48,20 +51,20 @@ class HeuristicPotholeDetector:
         
         # Tracking para estabilidade
         self._frame_count = 0
-        self._last_detections: List = []
+        self._last_detections = np.empty((0, 5), dtype=np.float32)
 
-    def detect(self, frame: np.ndarray) -> List[Tuple[float, float, float, float, float]]:
+    def detect(self, frame: np.ndarray) -> np.ndarray:
         """
         Detecta buracos no frame.
 
         Args:
-            frame: Imagem BGR (formato OpenCV)
+            frame: Imagem BGR, RGBA (leitura da GPU) ou já em escala de cinza
 
         Returns:
-            Lista de tuplas (x, y, w, h, confidence) com coordenadas normalizadas (0-1)
+            Array (N, 5) float32 com (x, y, w, h, confidence) normalizados (0-1)
         """
         if frame is None or frame.size == 0:
-            return []
+            return np.empty((0, 5), dtype=np.float32)
 
         self._frame_count += 1
 
@@ -74,14 +77,19 @@ class HeuristicPotholeDetector:
             roi_h, roi_w = roi.shape[:2]
             
             # === 2. PRÉ-PROCESSAMENTO OTIMIZADO ===
+            # Converte para escala de cinza antes do resize (1 canal em vez de 3)
+            if roi.ndim == 2:
+                gray = roi
+            elif roi.shape[2] == 4:
+                gray = cv2.cvtColor(roi, cv2.COLOR_RGBA2GRAY)
+            else:
+                gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            
             # Redimensiona para processamento mais rápido se muito grande
             scale = 1.0
             if roi_w > 640:
                 scale = 640.0 / roi_w
-                roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
-            
-            # Converte para escala de cinza
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
             
             # Equalização adaptativa de histograma
             enhanced = self._clahe.apply(gray)
@@ -156,7 +164,7 @@ class HeuristicPotholeDetector:
             detections = self._nms(detections, iou_threshold=0.3)
             
             # Mantém top 5
-            detections = detections[:5]
+            detections = np.asarray(detections[:5], dtype=np.float32).reshape(-1, 5)
             
             # Atualiza cache
             self._last_detections = detections
@@ -165,7 +173,7 @@ class HeuristicPotholeDetector:
 
         except Exception as e:
             # Em produção, retorna última detecção válida em caso de erro
-            return self._last_detections if self._last_detections else []
+            return self._last_detections
 
     def _compute_confidence(
         self,
@@ -4,7 +4,7 @@ Detector de Buracos com YOLO (ONNX)
 Usa modelo YOLO11 treinado para detecção precisa de buracos.
 """
 
-from typing import List, Tuple, Optional
+from typing import Tuple
 import cv2
 import numpy as np
 import os
@@ -18,12 +18,16 @@ class YOLOPotholeDetector:
     disponível no Android via python-for-android.
     """
 
+    # blobFromImage copiaria o frame inteiro se recebesse uma view com strides
+    requires_contiguous = True
+
     def __init__(
         self,
         model_path: str = "pothole_detector.onnx",
         conf_threshold: float = 0.5,
         nms_threshold: float = 0.4,
-        input_size: Tuple[int, int] = (320, 320)
+        input_size: Tuple[int, int] = (320, 320),
+        use_gpu: bool = False
     ):
         """
         Args:
@@ -31,18 +35,36 @@ class YOLOPotholeDetector:
             conf_threshold: Confiança mínima para detecção (0.5 = 50%)
             nms_threshold: Threshold para Non-Maximum Suppression
             input_size: Tamanho de entrada do modelo (largura, altura)
+            use_gpu: Tenta rodar a inferência na GPU via OpenCL (fallback CPU)
         """
         self.conf_threshold = conf_threshold
         self.nms_threshold = nms_threshold
         self.input_size = input_size
+        self.use_gpu = use_gpu
+        self.backend = "CPU"
+        self.quantized = False  # True quando o modelo INT8 foi carregado
         self.net = None
         self.model_loaded = False
+        self._input_buf = None  # Frame reduzido ao tamanho de entrada, reutilizado
+        self._rgb_buf = None  # Entrada RGBA convertida para RGB, reutilizada
         
         # Tenta carregar o modelo
         self._load_model(model_path)
 
     def _load_model(self, model_path: str) -> bool:
-        """Carrega o modelo ONNX."""
+        """Carrega o modelo ONNX (versão INT8 primeiro, FP32 como fallback)."""
+        # Modelo quantizado (<nome>_int8.onnx, ver training/) tem prioridade:
+        # ~4x menor e mais rápido no celular. Formato QDQ - entrada continua float
+        stem, ext = os.path.splitext(model_path)
+        for name, quantized in ((f"{stem}_int8{ext}", True), (model_path, False)):
+            if self._try_load(name, quantized):
+                return True
+        
+        print("⚠️ Modelo ONNX não encontrado. Usando fallback com heurísticas.")
+        return False
+
+    def _try_load(self, model_path: str, quantized: bool) -> bool:
+        """Procura o modelo nos locais conhecidos e carrega o primeiro válido."""
         # Lista de possíveis locais do modelo
         possible_paths = [
             model_path,
@@ -55,30 +77,52 @@ class YOLOPotholeDetector:
             if os.path.exists(path):
                 try:
                     self.net = cv2.dnn.readNetFromONNX(path)
-                    # Usa OpenCL se disponível (GPU móvel)
                     self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
-                    self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+                    self.quantized = quantized
+                    self.backend = self._select_target()
                     self.model_loaded = True
-                    print(f"Modelo YOLO carregado: {path}")
+                    precision = "INT8" if quantized else "FP32"
+                    print(f"Modelo YOLO carregado: {path} ({precision}, {self.backend})")
                     return True
                 except Exception as e:
                     print(f"Erro ao carregar modelo {path}: {e}")
-        
-        print("⚠️ Modelo ONNX não encontrado. Usando fallback com heurísticas.")
         return False
 
-    def detect(self, frame: np.ndarray) -> List[Tuple[float, float, float, float, float]]:
+    def _select_target(self) -> str:
+        """Escolhe onde a rede roda: OpenCL (GPU móvel) se pedido e disponível, senão CPU."""
+        # Camadas INT8 do OpenCV DNN só existem na CPU
+        if self.use_gpu and not self.quantized:
+            try:
+                if cv2.ocl.haveOpenCL():
+                    cv2.ocl.setUseOpenCL(True)
+                    self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_OPENCL_FP16)
+                    return "OpenCL FP16"
+            except Exception as e:
+                print(f"OpenCL indisponível: {e}")
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        return "CPU"
+
+    def _fallback_to_cpu(self, error: Exception) -> bool:
+        """Volta a rede para CPU se a GPU falhar. Retorna True se trocou."""
+        if self.backend == "CPU":
+            return False
+        print(f"Inferência {self.backend} falhou, voltando para CPU: {error}")
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        self.backend = "CPU"
+        return True
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
         """
         Detecta buracos no frame.
 
         Args:
-            frame: Imagem BGR (formato OpenCV)
+            frame: Imagem BGR (H, W, 3) ou RGBA (H, W, 4), como lida da GPU
 
         Returns:
-            Lista de tuplas (x, y, w, h, confidence) com coordenadas normalizadas (0-1)
+            Array (N, 5) float32 com (x, y, w, h, confidence) normalizados (0-1)
         """
         if frame is None or frame.size == 0:
-            return []
+            return np.empty((0, 5), dtype=np.float32)
 
         if not self.model_loaded:
             # Fallback para detector baseado em heurísticas
@@ -87,13 +131,15 @@ class YOLOPotholeDetector:
         try:
             height, width = frame.shape[:2]
             
-            # Pré-processamento para YOLO
+            # Pré-processamento para YOLO (frame já no tamanho de entrada:
+            # blobFromImage só converte, sem redimensionar)
+            image, swap_rb = self._model_input(frame)
             blob = cv2.dnn.blobFromImage(
-                frame,
+                image,
                 scalefactor=1/255.0,
                 size=self.input_size,
                 mean=(0, 0, 0),
-                swapRB=True,
+                swapRB=swap_rb,
                 crop=False
             )
             
@@ -107,83 +153,99 @@ class YOLOPotholeDetector:
             return detections
 
         except Exception as e:
+            if self._fallback_to_cpu(e):
+                return self.detect(frame)
             print(f"Erro na detecção YOLO: {e}")
             return self._detect_fallback(frame)
 
+    def _resize_input(self, frame: np.ndarray) -> np.ndarray:
+        """Reduz o frame ao tamanho de entrada do modelo num buffer reutilizado.
+
+        O blobFromImage redimensionaria com bilinear numa imagem nova a cada
+        chamada; INTER_AREA reduz com menos aliasing e sem alocar.
+        """
+        width, height = self.input_size
+        if frame.shape[1] == width and frame.shape[0] == height:
+            return frame
+        shape = (height, width) + frame.shape[2:]
+        if self._input_buf is None or self._input_buf.shape != shape:
+            self._input_buf = np.empty(shape, dtype=np.uint8)
+        return cv2.resize(frame, self.input_size, dst=self._input_buf,
+                          interpolation=cv2.INTER_AREA)
+
+    def _model_input(self, frame: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Frame no tamanho de entrada e se o blobFromImage deve trocar R e B.
+
+        RGBA é reduzido primeiro e só então convertido para RGB: a troca de
+        canais roda sobre a entrada do modelo, não sobre o frame inteiro.
+        """
+        small = self._resize_input(frame)
+        if small.ndim == 3 and small.shape[2] == 4:
+            if self._rgb_buf is None or self._rgb_buf.shape[:2] != small.shape[:2]:
+                self._rgb_buf = np.empty(small.shape[:2] + (3,), dtype=np.uint8)
+            # Já em RGB, a ordem que o modelo espera: sem swapRB
+            return cv2.cvtColor(small, cv2.COLOR_RGBA2RGB, dst=self._rgb_buf), False
+        return small, True
+
     def _process_outputs(
         self,
         outputs: np.ndarray,
         img_width: int,
         img_height: int
-    ) -> List[Tuple[float, float, float, float, float]]:
+    ) -> np.ndarray:
         """
         Processa saída do modelo YOLO.
         
         A saída do YOLO11 tem formato [1, 5, N] onde:
         - 5 = [x_center, y_center, width, height, confidence]
         - N = número de detecções
+
+        Todas as N candidatas são filtradas e convertidas de uma vez (NumPy),
+        sem laço Python por candidata.
         """
-        detections = []
-        boxes = []
-        confidences = []
-        
         # Formato YOLO11 ONNX: [1, 5, N] -> transpor para [N, 5]
         if len(outputs.shape) == 3:
             outputs = outputs[0].T
         
-        for detection in outputs:
-            if len(detection) >= 5:
-                # Para YOLO com classes, pegar max class score
-                if len(detection) > 5:
-                    class_scores = detection[4:]
-                    confidence = np.max(class_scores)
-                else:
-                    confidence = detection[4]
-                
-                if confidence >= self.conf_threshold:
-                    # Coordenadas do centro e dimensões
-                    cx, cy, w, h = detection[:4]
-                    
-                    # Normalizar para 0-1
-                    cx_norm = cx / self.input_size[0]
-                    cy_norm = cy / self.input_size[1]
-                    w_norm = w / self.input_size[0]
-                    h_norm = h / self.input_size[1]
-                    
-                    # Converter de centro para canto superior esquerdo
-                    x_norm = cx_norm - w_norm / 2
-                    y_norm = cy_norm - h_norm / 2
-                    
-                    # Clamp para 0-1
-                    x_norm = max(0, min(1, x_norm))
-                    y_norm = max(0, min(1, y_norm))
-                    w_norm = max(0, min(1 - x_norm, w_norm))
-                    h_norm = max(0, min(1 - y_norm, h_norm))
-                    
-                    boxes.append([x_norm, y_norm, w_norm, h_norm])
-                    confidences.append(float(confidence))
+        if outputs.ndim != 2 or outputs.shape[1] < 5:
+            return np.empty((0, 5), dtype=np.float32)
+
+        # Para YOLO com classes, pegar max class score
+        if outputs.shape[1] > 5:
+            confidences = outputs[:, 4:].max(axis=1)
+        else:
+            confidences = outputs[:, 4]
         
-        # Non-Maximum Suppression
-        if boxes:
-            # Converter para formato OpenCV NMS (pixels)
-            boxes_px = [[int(b[0]*100), int(b[1]*100), int(b[2]*100), int(b[3]*100)] for b in boxes]
-            indices = cv2.dnn.NMSBoxes(boxes_px, confidences, self.conf_threshold, self.nms_threshold)
-            
-            if len(indices) > 0:
-                for i in indices.flatten():
-                    detections.append((
-                        boxes[i][0],
-                        boxes[i][1],
-                        boxes[i][2],
-                        boxes[i][3],
-                        confidences[i]
-                    ))
+        keep = confidences >= self.conf_threshold
+        if not keep.any():
+            return np.empty((0, 5), dtype=np.float32)
+        candidates = outputs[keep, :4]
+        confidences = confidences[keep].astype(np.float32)
+
+        # Normalizar para 0-1
+        in_w, in_h = self.input_size
+        w_norm = candidates[:, 2] / in_w
+        h_norm = candidates[:, 3] / in_h
+        
+        # Converter de centro para canto superior esquerdo + clamp para 0-1
+        x_norm = np.clip(candidates[:, 0] / in_w - w_norm / 2, 0, 1)
+        y_norm = np.clip(candidates[:, 1] / in_h - h_norm / 2, 0, 1)
+        w_norm = np.maximum(0, np.minimum(1 - x_norm, w_norm))
+        h_norm = np.maximum(0, np.minimum(1 - y_norm, h_norm))
+        
+        boxes = np.stack((x_norm, y_norm, w_norm, h_norm, confidences), axis=1).astype(np.float32)
+
+        # Non-Maximum Suppression (formato OpenCV NMS, em "pixels" de 0-100)
+        boxes_px = (boxes[:, :4] * 100).astype(np.int32)
+        indices = cv2.dnn.NMSBoxes(boxes_px, confidences, self.conf_threshold, self.nms_threshold)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
         
         # Ordenar por confiança e limitar
-        detections.sort(key=lambda x: x[4], reverse=True)
-        return detections[:5]
+        detections = boxes[indices]
+        order = np.argsort(-detections[:, 4], kind="stable")
+        return detections[order[:5]]
 
-    def _detect_fallback(self, frame: np.ndarray) -> List[Tuple[float, float, float, float, float]]:
+    def _detect_fallback(self, frame: np.ndarray) -> np.ndarray:
         """
         Fallback: detector baseado em heurísticas quando modelo ONNX não está disponível.
         MUITO menos preciso que YOLO - apenas para não quebrar o app.
@@ -194,7 +256,7 @@ class YOLOPotholeDetector:
             fallback = HeuristicPotholeDetector(min_confidence=0.85)
             return fallback.detect(frame)
         except:
-            return []
+            return np.empty((0, 5), dtype=np.float32)
 
 
 # Alias para compatibilidade
@@ -5,9 +5,9 @@ Usa câmera traseira + IA para detectar buracos na pista em tempo real.
 """
 
 import os
-from datetime import datetime
-from typing import List, Tuple
-from collections import deque
+import queue
+import threading
+import time
 
 # Kivy config DEVE vir antes de qualquer outro import do Kivy
 os.environ.setdefault('KIVY_LOG_LEVEL', 'info')
@@ -15,24 +15,45 @@ os.environ.setdefault('KIVY_LOG_LEVEL', 'info')
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.graphics import Color, Line, Rectangle
+from kivy.graphics import Color, Fbo, InstructionGroup, Line, Rectangle
 from kivy.graphics.texture import Texture
 from kivy.logger import Logger
+from kivy.metrics import dp
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
 from kivy.uix.slider import Slider
 from kivy.uix.checkbox import CheckBox
 from kivy.uix.widget import Widget
 from kivy.utils import platform
 
+# NumPy/OpenCV no topo (não a cada frame); sem eles o app abre, mas não processa
+try:
+    import numpy as np
+    import cv2
+except ImportError as e:
+    Logger.warning(f"NumPy/OpenCV indisponível: {e}")
+    np = cv2 = None
+
 # Detecção de plataforma
 IS_ANDROID = platform == "android"
 
+# Lado maior (px) do frame lido da GPU: o YOLO usa 320x320 e a heurística
+# limita a ROI a 640 de largura, então ler mais que isso só gasta banda
+READBACK_MAX_SIDE = 640
+
+# Intervalo mínimo entre capturas (60 FPS para alta velocidade, 100 km/h);
+# com inferência mais lenta a captura acompanha o ritmo do detector
+CAPTURE_MIN_INTERVAL = 1 / 60
+
+# Espera máxima (s) pela saída do worker ao parar o processamento
+WORKER_JOIN_TIMEOUT = 1.0
+
 # Imports condicionais para Android
 if IS_ANDROID:
     try:
@@ -50,9 +71,96 @@ else:
     PythonActivity = Context = None
 
 
-class DebugPanel(ScrollView):
-    """Painel de debug com logs em tempo real."""
-    
+def _put_latest(q: queue.Queue, item):
+    """Coloca item em uma fila de 1 posição, descartando o anterior se cheia."""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def _scale_boxes(dets, disp_x: float, disp_y: float, disp_w: float, disp_h: float):
+    """Converte caixas normalizadas (N, 5) em retângulos de tela (N, 4).
+
+    Origem do Kivy é embaixo, então o y da caixa é invertido. Todas as
+    caixas são calculadas de uma vez (sem aritmética Python por caixa).
+    """
+    rects = np.empty((dets.shape[0], 4), dtype=np.float32)
+    rects[:, 0] = disp_x + dets[:, 0] * disp_w
+    rects[:, 1] = (disp_y + disp_h) - (dets[:, 1] + dets[:, 3]) * disp_h
+    rects[:, 2] = dets[:, 2] * disp_w
+    rects[:, 3] = dets[:, 3] * disp_h
+    return rects
+
+
+def _oriented_tex_coords(texture, rotation_mode: int, mirror: bool):
+    """tex_coords que desenham a textura já espelhada/rotacionada num Fbo.
+
+    Para cada canto do Fbo (x = coluna, y = linha do frame lido, normalizados)
+    calcula o ponto da textura que a versão CPU (espelho + cv2.rotate)
+    colocaria ali. Usa a ordem de armazenamento da textura (ignora flips),
+    como a leitura direta.
+    """
+    u, v = texture.uvpos
+    du, dv = texture.uvsize
+    u0, u1 = sorted((u, u + du))
+    v0, v1 = sorted((v, v + dv))
+
+    coords = []
+    for x, y in ((0, 0), (1, 0), (1, 1), (0, 1)):
+        if rotation_mode == 1:  # 90° horário
+            tu, tv = y, 1 - x
+        elif rotation_mode == 2:  # 180°
+            tu, tv = 1 - x, 1 - y
+        elif rotation_mode == 3:  # 270° (90° anti-horário)
+            tu, tv = 1 - y, x
+        else:
+            tu, tv = x, y
+        if mirror:
+            tu = 1 - tu
+        coords += (u0 + tu * (u1 - u0), v0 + tv * (v1 - v0))
+    return tuple(coords)
+
+
+class DebugLogLine(Label):
+    """Uma linha do painel de debug (viewclass do RecycleView)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.font_size = "12sp"
+        self.halign = "left"
+        self.valign = "middle"
+        self.shorten = True
+        self.bind(size=self._update_text_size)
+
+    def _update_text_size(self, *_):
+        self.text_size = self.size
+
+
+class DebugPanel(RecycleView):
+    """Painel de debug com logs em tempo real.
+
+    Só as linhas visíveis viram widgets: adicionar um log custa o mesmo
+    independente do tamanho do histórico.
+    """
+
+    MAX_LINES = 50
+
+    # Cor de cada nível (rgba direto no Label, sem markup)
+    LEVEL_COLORS = {
+        "DETECT": (1, 0.6, 0, 1),    # Laranja
+        "ALERT": (1, 0, 0, 1),       # Vermelho
+        "OK": (0, 1, 0, 1),          # Verde
+    }
+    DEFAULT_COLOR = (0.67, 0.67, 0.67, 1)  # Cinza
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.size_hint = (1, None)
@@ -60,58 +168,129 @@ class DebugPanel(ScrollView):
         self.do_scroll_x = False
         self.bar_width = 10
         self.bar_color = (0.5, 0.5, 0.5, 0.8)
-        
-        self.log_label = Label(
-            text="[DEBUG] Painel de logs\n",
-            markup=True,
+
+        self.viewclass = DebugLogLine
+        layout = RecycleBoxLayout(
+            orientation="vertical",
             size_hint_y=None,
-            font_size="12sp",
-            halign="left",
-            valign="top",
-            color=(0.8, 1, 0.8, 1)
+            default_size=(None, dp(16)),
+            default_size_hint=(1, None)
         )
-        self.log_label.bind(texture_size=self._update_height)
-        self.log_label.bind(width=lambda *_: setattr(self.log_label, 'text_size', (self.log_label.width, None)))
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+        self.data = [{"text": "[DEBUG] Painel de logs", "color": (0.8, 1, 0.8, 1)}]
+
+        # Timestamp "HH:MM:SS" formatado no máximo uma vez por segundo
+        self._ts_second = -1
+        self._ts_text = ""
+
+        # Auto-scroll só depois do RecycleView refazer o layout com os novos dados
+        self._scroll_to_end_trigger = Clock.create_trigger(self._scroll_to_end)
         
-        self.add_widget(self.log_label)
+    def add_log(self, message: str, level: str = "INFO"):
+        """Adiciona uma linha de log."""
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts_text = time.strftime("%H:%M:%S", time.localtime(now))
+        timestamp = self._ts_text
         
-        # Histórico de logs (máximo 50 linhas)
-        self.log_history = deque(maxlen=50)
+        color = self.LEVEL_COLORS.get(level, self.DEFAULT_COLOR)
         
-    def _update_height(self, *_):
-        self.log_label.height = max(self.log_label.texture_size[1], self.height)
-        # Auto-scroll para o final
-        self.scroll_y = 0
+        # Mensagens com várias linhas viram várias linhas do painel
+        first, *rest = message.split("\n")
+        rows = [{"text": f"[{timestamp}] {first}", "color": color}]
+        rows.extend({"text": f"    {line}", "color": color} for line in rest)
         
-    def add_log(self, message: str, level: str = "INFO"):
-        """Adiciona uma linha de log."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if level == "DETECT":
-            color = "[color=ff9900]"  # Laranja
-        elif level == "ALERT":
-            color = "[color=ff0000]"  # Vermelho
-        elif level == "OK":
-            color = "[color=00ff00]"  # Verde
-        else:
-            color = "[color=aaaaaa]"  # Cinza
-            
-        log_line = f"{color}[{timestamp}] {message}[/color]"
-        self.log_history.append(log_line)
+        data = self.data
+        data.extend(rows)
+        if len(data) > self.MAX_LINES:
+            del data[:len(data) - self.MAX_LINES]
         
-        self.log_label.text = "\n".join(self.log_history)
+        # Auto-scroll para o final (no próximo frame, após o layout)
+        self._scroll_to_end_trigger()
+
+    def _scroll_to_end(self, *_):
+        self.scroll_y = 0
 
 
 class AlertOverlay(Widget):
     """Overlay visual para mostrar detecções na tela."""
 
+    # Instruções (Color + Line) pré-alocadas: os detectores retornam no
+    # máximo 5 caixas (top 5), o pool só cresce se isso mudar
+    POOL_SIZE = 5
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._detections: List[Tuple[float, float, float, float, float]] = []
+        self._detections = None  # Array (N, 5) do último desenho
         self._min_confidence = 0.5
         self._show_all = False  # Quando True, mostra detecções de baixa confiança também
+        self._last_sig = None  # Assinatura do último desenho (evita redesenhar o mesmo)
+        self._pool = []  # (grupo_caixa, cor_caixa, caixa, barra) por detecção
+        self._visible = 0  # Quantas entradas do pool estão no canvas
+        # Grupos fixos no canvas: só as entradas visíveis ficam dentro deles.
+        # Barras vêm depois das caixas, sob um único Color amarelo
+        self._boxes = InstructionGroup()
+        self._bars = InstructionGroup()
+        self._bars.add(Color(1, 1, 0, 1))  # Barra de confiança: sempre amarela
+        self.canvas.after.add(self._boxes)
+        self.canvas.after.add(self._bars)
+        self._disp_key = None  # (textura, tamanho, posição) do último cálculo de área
+        self._disp_rect = None  # Área de display (x, y, w, h) correspondente
+        self._grow_pool(self.POOL_SIZE)
         self.bind(pos=self._update_canvas, size=self._update_canvas)
 
+    def _grow_pool(self, size: int):
+        """Garante pelo menos `size` entradas de instruções no pool."""
+        while len(self._pool) < size:
+            group = InstructionGroup()
+            box_color = Color(0, 0, 0, 0)
+            box_line = Line(width=3)
+            group.add(box_color)
+            group.add(box_line)
+            self._pool.append((group, box_color, box_line, Line(width=5)))
+
+    def _set_visible(self, count: int):
+        """Deixa no canvas só as `count` primeiras entradas do pool.
+
+        Entradas escondidas saem dos grupos (não são desenhadas) e voltam
+        com um add, sem recriar instruções.
+        """
+        for group, _, _, bar_line in self._pool[self._visible:count]:
+            self._boxes.add(group)
+            self._bars.add(bar_line)
+        for group, _, _, bar_line in self._pool[count:self._visible]:
+            self._boxes.remove(group)
+            self._bars.remove(bar_line)
+        self._visible = count
+
+    def _display_rect(self, widget):
+        """Área (x, y, w, h) onde o frame aparece dentro do widget de display.
+
+        Recalculada só quando textura, tamanho ou posição do widget mudam.
+        """
+        if not (widget and widget.texture):
+            return self.x, self.y, self.width, self.height
+
+        key = (widget.texture.size, tuple(widget.size), tuple(widget.pos))
+        if key == self._disp_key:
+            return self._disp_rect
+
+        # Calcula escala mantendo proporção
+        (tex_w, tex_h), (widget_w, widget_h), (widget_x, widget_y) = key
+        scale = min(widget_w / tex_w, widget_h / tex_h) if tex_w > 0 and tex_h > 0 else 1
+        disp_w = tex_w * scale
+        disp_h = tex_h * scale
+        self._disp_rect = (
+            widget_x + (widget_w - disp_w) / 2,
+            widget_y + (widget_h - disp_h) / 2,
+            disp_w,
+            disp_h,
+        )
+        self._disp_key = key
+        return self._disp_rect
+
     def set_min_confidence(self, value: float):
         """Define confiança mínima para alertas."""
         self._min_confidence = value
@@ -124,63 +303,74 @@ class AlertOverlay(Widget):
         """Redesenha quando posição/tamanho mudam."""
         self.show_detections(self._detections)
 
-    def show_detections(self, detections: List[Tuple[float, float, float, float, float]], display_widget=None):
-        """Desenha caixas ao redor das detecções - cores baseadas na confiança."""
-        self._detections = detections or []
-        self.canvas.after.clear()
+    def show_detections(self, detections, display_widget=None):
+        """Desenha caixas ao redor das detecções - cores baseadas na confiança.
 
-        if not detections:
+        Args:
+            detections: Array (N, 5) com (x, y, w, h, confidence) normalizados
+        """
+        if detections is None or len(detections) == 0:
+            self.clear()
             return
+        self._detections = detections
 
-        # Usa dimensões do widget de display (Image ou Camera)
-        widget = display_widget
-        if widget and widget.texture:
-            # Calcula área real do display
-            tex_w, tex_h = widget.texture.size
-            widget_w, widget_h = widget.size
-            widget_x, widget_y = widget.pos
-            
-            # Calcula escala mantendo proporção
-            scale = min(widget_w / tex_w, widget_h / tex_h) if tex_w > 0 and tex_h > 0 else 1
-            disp_w = tex_w * scale
-            disp_h = tex_h * scale
-            disp_x = widget_x + (widget_w - disp_w) / 2
-            disp_y = widget_y + (widget_h - disp_h) / 2
-        else:
-            disp_x, disp_y = self.x, self.y
-            disp_w, disp_h = self.width, self.height
-
-        with self.canvas.after:
-            for x_norm, y_norm, w_norm, h_norm, conf in detections:
-                # Filtrar por confiança (a menos que show_all esteja ativo)
-                if not self._show_all and conf < self._min_confidence:
-                    continue
-                    
-                # Cor baseada na confiança:
-                # Verde = baixa (< 30%), Amarelo = média (30-70%), Vermelho = alta (> 70%)
-                if conf >= 0.7:
-                    Color(1, 0, 0, 0.9)  # Vermelho - alta confiança
-                elif conf >= 0.3:
-                    Color(1, 0.7, 0, 0.8)  # Laranja - média confiança
-                else:
-                    Color(0, 1, 0, 0.6)  # Verde - baixa confiança
-                
-                x = disp_x + x_norm * disp_w
-                y = disp_y + (1 - y_norm - h_norm) * disp_h
-                w = w_norm * disp_w
-                h = h_norm * disp_h
-                
-                # Caixa de detecção
-                Line(rectangle=(x, y, w, h), width=3)
+        disp_x, disp_y, disp_w, disp_h = self._display_rect(display_widget)
+
+        dets = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+
+        # Pula o redesenho se as caixas (quantizadas) e a área de display
+        # são as mesmas do último frame - cena parada não mexe no canvas.
+        # Quantização em lote: caixas em milésimos, confiança em centésimos
+        quantized = np.rint(dets * (1000, 1000, 1000, 1000, 100)).astype(np.int32)
+        sig = (
+            round(disp_x), round(disp_y), round(disp_w), round(disp_h),
+            self._show_all, self._min_confidence,
+            quantized.tobytes(),
+        )
+        if sig == self._last_sig:
+            return
+        self._last_sig = sig
+
+        # Filtrar por confiança (a menos que show_all esteja ativo)
+        if not self._show_all:
+            dets = dets[dets[:, 4] >= self._min_confidence]
+
+        if len(dets) > len(self._pool):
+            self._grow_pool(len(dets))
+
+        # Retângulos de tela calculados em lote
+        rects = _scale_boxes(dets, disp_x, disp_y, disp_w, disp_h).tolist()
+        confs = dets[:, 4].tolist()
+
+        # Só altera atributos das instruções existentes - nada é recriado
+        for (x, y, w, h), conf, entry in zip(rects, confs, self._pool):
+            _, box_color, box_line, bar_line = entry
                 
-                # Barra de confiança
-                Color(1, 1, 0, 1)
-                Line(rectangle=(x, y + h, w * conf, 5), width=5)
+            # Cor baseada na confiança:
+            # Verde = baixa (< 30%), Amarelo = média (30-70%), Vermelho = alta (> 70%)
+            if conf >= 0.7:
+                box_color.rgba = (1, 0, 0, 0.9)  # Vermelho - alta confiança
+            elif conf >= 0.3:
+                box_color.rgba = (1, 0.7, 0, 0.8)  # Laranja - média confiança
+            else:
+                box_color.rgba = (0, 1, 0, 0.6)  # Verde - baixa confiança
+            
+            # Caixa de detecção
+            box_line.rectangle = (x, y, w, h)
+            
+            # Barra de confiança
+            bar_line.rectangle = (x, y + h, w * conf, 5)
+
+        # Mostra as entradas usadas e tira do canvas as que sobraram
+        self._set_visible(len(rects))
 
     def clear(self):
         """Limpa todas as detecções."""
-        self._detections = []
-        self.canvas.after.clear()
+        if self._detections is None and not self._visible:
+            return  # Já está limpo
+        self._detections = None
+        self._last_sig = None
+        self._set_visible(0)
 
 
 class PotholeDetectorLayout(BoxLayout):
@@ -197,16 +387,51 @@ class PotholeDetectorLayout(BoxLayout):
         self.detector = None
         self.processing_event = None
         self.detection_count = 0
-        self.last_alert_time = None
+        self.last_alert_time = float("-inf")  # time.monotonic() do último alerta
         self.alert_cooldown = 2.0
         self.debug_enabled = False
         self.frame_count = 0
-        self.last_fps_time = datetime.now()
+        self.last_fps_time = time.monotonic()
         self.current_fps = 0
         self.rotation_mode = 0  # 0=nenhuma, 1=90°, 2=180°, 3=270°
         self.mirror_mode = False  # Espelhar imagem horizontalmente
         self.min_confidence = 0.5  # 50% padrão - ajustável nas configurações
         self.show_low_confidence = False  # Mostrar detecções de baixa confiança
+        self._readback_fbo = None  # Fbo reutilizado para ler os pixels da câmera
+        self._readback_src = None  # Textura para a qual o Fbo foi montado
+        self._readback_scaled = False  # Fbo desenha a textura (reduzida/rotacionada)
+        self._orient_on_gpu = True  # Espelho/rotação feitos no Fbo de leitura
+        self._nv21_camera = None  # Provider Android com grab_frame() (NV21 sem GL)
+        self._frame_events = False  # Provider avisa frames novos via on_texture
+        self._new_frame = False  # Chegou frame desde a última captura
+        self._rgba_buf = None  # Frame NV21 decodificado (RGBA), reutilizado entre frames
+        self._nv21_buf = None  # Frame NV21 reduzido (câmera acima de READBACK_MAX_SIDE)
+        self._rot_buf = None  # Buffer para rotação quando o detector exige contíguo
+        self._display_bufs = []  # Buffers RGBA do display, usados em rodízio
+        self._display_idx = 0
+        self._pipeline = self._proc_r0  # Preparo do frame (ver _rebuild_pipeline)
+
+        # Processamento em thread separada: filas de 1 posição (frame mais recente)
+        self._frame_q = queue.Queue(maxsize=1)
+        self._result_q = queue.Queue(maxsize=1)
+        self._worker = None
+        self._stopping_worker = None  # Worker parado que ainda não saiu
+        self._drain_event = None
+
+        # Eventos únicos reaproveitados (um ClockEvent cada, não um por chamada)
+        self._start_camera_trigger = Clock.create_trigger(self._start_camera, 0.5)
+        self._start_processing_trigger = Clock.create_trigger(self._delayed_start_processing, 1.0)
+        self._reinit_camera_trigger = Clock.create_trigger(self._init_camera_cb, 2.0)
+        # Captura se reagenda sozinha (intervalo ajustado pela latência)
+        self._capture_trigger = Clock.create_trigger(self._process_frame, CAPTURE_MIN_INTERVAL)
+        self._infer_latency = 0.0  # Duração da última detecção no worker (s)
+        self._camera_resolution = None
+
+        # Último conteúdo dos labels: só reatribui (e re-renderiza) se mudou
+        self._last_status = None
+        self._last_counter_text = None
+        self._alert_active = False  # Status mostra o alerta de buraco
+        self._vibrator = None  # android.os.Vibrator, obtido no primeiro alerta
 
         # UI Components
         self.status_label = Label(
@@ -327,11 +552,15 @@ class PotholeDetectorLayout(BoxLayout):
         """Reseta o contador de detecções."""
         self.detection_count = 0
         self._update_counter_label()
-        self._log("Contador resetado", "OK")
+        self._log("Contador resetado", level="OK")
 
     def _update_counter_label(self):
         """Atualiza o label do contador."""
-        self.counter_label.text = f"Buracos: {self.detection_count} | Confiança mín: {int(self.min_confidence*100)}%"
+        text = f"Buracos: {self.detection_count} | Confiança mín: {int(self.min_confidence*100)}%"
+        if text == self._last_counter_text:
+            return
+        self._last_counter_text = text
+        self.counter_label.text = text
 
     def _show_config(self, *_):
         """Mostra popup de configurações."""
@@ -424,12 +653,13 @@ class PotholeDetectorLayout(BoxLayout):
         def save_config(*_):
             self.min_confidence = conf_slider.value / 100.0
             self.mirror_mode = mirror_check.active
+            self._rebuild_pipeline()
             self.alert_overlay.set_min_confidence(self.min_confidence)
             if self.detector:
                 self.detector.min_confidence = self.min_confidence
             self._update_counter_label()
-            self._log(f"Confiança alterada para {int(self.min_confidence*100)}%", "OK")
-            self._log(f"Espelhamento: {'Ativado' if self.mirror_mode else 'Desativado'}", "OK")
+            self._log("Confiança alterada para %d%%", int(self.min_confidence*100), level="OK")
+            self._log("Espelhamento: %s", 'Ativado' if self.mirror_mode else 'Desativado', level="OK")
             popup.dismiss()
         
         cancel_btn.bind(on_press=popup.dismiss)
@@ -448,10 +678,13 @@ class PotholeDetectorLayout(BoxLayout):
             self.debug_btn.background_color = (0.5, 0.3, 0.3, 1)
             # Ativar visualização de todas as detecções
             self.alert_overlay.set_show_all(True)
-            self._log("Debug ATIVADO - mostrando todas as detecções", "OK")
-            self._log(f"Detector: {self.detector.detector_name if self.detector else 'Não inicializado'}", "INFO")
-            self._log(f"Confiança mínima: {int(self.min_confidence*100)}%", "INFO")
-            self._log(f"Rotação: {self.rotation_mode * 90}°", "INFO")
+            self._log("Debug ATIVADO - mostrando todas as detecções", level="OK")
+            self._log("Detector: %s", self.detector.detector_name if self.detector else 'Não inicializado')
+            if self.detector:
+                self._log("Backend: %s (%s)", self.detector.backend,
+                          "INT8" if self.detector.quantized else "FP32")
+            self._log("Confiança mínima: %d%%", int(self.min_confidence*100))
+            self._log("Rotação: %d°", self.rotation_mode * 90)
         else:
             self.debug_panel.opacity = 0
             self.debug_panel.height = 0
@@ -465,25 +698,32 @@ class PotholeDetectorLayout(BoxLayout):
         self.rotation_mode = (self.rotation_mode + 1) % 4
         rotation_degrees = self.rotation_mode * 90
         self.rotate_btn.text = f"🔄 {rotation_degrees}°"
-        self._log(f"Rotação alterada para {rotation_degrees}°", "OK")
-        self._log("A visualização agora mostra o mesmo que o detector vê", "INFO")
+        self._rebuild_pipeline()
+        self._log("Rotação alterada para %d°", rotation_degrees, level="OK")
+        self._log("A visualização agora mostra o mesmo que o detector vê")
 
-    def _log(self, message: str, level: str = "INFO"):
-        """Adiciona log ao painel de debug - sempre adiciona quando debug está ativo."""
-        if self.debug_enabled:
-            self.debug_panel.add_log(message, level)
+    def _log(self, fmt: str, *args, level: str = "INFO"):
+        """Adiciona log ao painel de debug - sempre adiciona quando debug está ativo.
+
+        A formatação (``fmt % args``) só acontece com o debug ligado.
+        """
+        if not self.debug_enabled:
+            return
+        self.debug_panel.add_log(fmt % args if args else fmt, level)
 
     def _initialize(self, *_):
         """Inicializa detector e solicita permissões."""
         try:
             from detector import PotholeDetector
-            self.detector = PotholeDetector()
-            Logger.info("App: Detector inicializado com sucesso")
-            self._log(f"Detector carregado: {self.detector.detector_name}", "OK")
+            self.detector = PotholeDetector(use_gpu=True)
+            Logger.info(f"App: Detector inicializado com sucesso ({self.detector.backend})")
+            self._log("Detector carregado: %s", self.detector.detector_name, level="OK")
+            self._log("Detector backend: %s (%s)", self.detector.backend,
+                      "INT8" if self.detector.quantized else "FP32", level="OK")
         except Exception as e:
             Logger.error(f"App: Erro ao inicializar detector: {e}")
             self._update_status(f"Erro: {e}", error=True)
-            self._log(f"Erro ao carregar detector: {e}", "ALERT")
+            self._log("Erro ao carregar detector: %s", e, level="ALERT")
             return
 
         if IS_ANDROID:
@@ -507,7 +747,7 @@ class PotholeDetectorLayout(BoxLayout):
         def callback(permissions, grants):
             Logger.info(f"App: Callback permissões: {permissions} -> {grants}")
             if grants and all(grants):
-                Clock.schedule_once(lambda *_: self._init_camera(), 0.2)
+                Clock.schedule_once(self._init_camera_cb, 0.2)
             else:
                 self._on_permission_denied()
 
@@ -525,15 +765,18 @@ class PotholeDetectorLayout(BoxLayout):
         self.permission_btn.opacity = 1
         self.permission_btn.disabled = False
         self._update_status("Permissão necessária", error=True)
-        self._log("Permissão de câmera negada", "ALERT")
+        self._log("Permissão de câmera negada", level="ALERT")
 
     def _init_camera(self):
         """Inicializa a câmera com tratamento robusto de erros."""
         self._update_status("Iniciando câmera...")
-        self._log("Inicializando câmera...", "INFO")
+        self._log("Inicializando câmera...")
 
         # Tentar múltiplas configurações de câmera
+        # 640x360 primeiro: o detector trabalha em 320x320, então resoluções
+        # maiores só aumentam a banda copiada a cada frame (~4x menos que 720p)
         camera_configs = [
+            {"resolution": (640, 360), "index": 0},   # 16:9 leve, câmera 0
             {"resolution": (640, 480), "index": 0},   # Baixa resolução, câmera 0
             {"resolution": (1280, 720), "index": 0},  # HD, câmera 0
             {"resolution": (640, 480), "index": 1},   # Baixa resolução, câmera 1
@@ -542,17 +785,17 @@ class PotholeDetectorLayout(BoxLayout):
         
         for i, config in enumerate(camera_configs):
             try:
-                self._log(f"Tentativa {i+1}: res={config['resolution']}, cam={config['index']}", "INFO")
+                self._log("Tentativa %d: res=%s, cam=%d", i+1, config['resolution'], config['index'])
                 self._try_init_camera(config["resolution"], config["index"])
                 return  # Sucesso!
             except Exception as e:
                 error_msg = str(e)
-                self._log(f"Falha tentativa {i+1}: {error_msg[:50]}", "ALERT")
+                self._log("Falha tentativa %d: %s", i+1, error_msg[:50], level="ALERT")
                 Logger.warning(f"App: Câmera config {i+1} falhou: {e}")
                 continue
         
         # Todas as tentativas falharam
-        self._log("ERRO: Todas as configurações de câmera falharam!", "ALERT")
+        self._log("ERRO: Todas as configurações de câmera falharam!", level="ALERT")
         self._show_camera_error("Não foi possível iniciar a câmera.\nTente reiniciar o app.")
 
     def _try_init_camera(self, resolution, index):
@@ -569,17 +812,41 @@ class PotholeDetectorLayout(BoxLayout):
         if self.display_image.parent:
             self.camera_container.remove_widget(self.display_image)
 
-        # Câmera oculta (apenas para captura)
+        # Câmera oculta (apenas para captura) - sem allow_stretch/keep_ratio,
+        # pois nunca é exibida e não precisa recalcular o tamanho da textura
         self.camera = Camera(
             resolution=resolution,
             play=False,
-            index=index,
-            allow_stretch=True,
-            keep_ratio=False
+            index=index
         )
         self.camera.opacity = 0  # Ocultar câmera - vamos mostrar display_image
         self.camera.size_hint = (1, 1)
-        
+
+        # Verificar se o backend respeitou a resolução pedida. Se entregou
+        # outra, ela é aceita: o Fbo de leitura e _shrink_nv21 já limitam o
+        # frame lido/convertido a READBACK_MAX_SIDE
+        core_camera = getattr(self.camera, '_camera', None)
+        if core_camera is not None:
+            actual = tuple(core_camera.resolution)
+            if actual != tuple(resolution):
+                self._log("Backend ajustou resolução: %dx%d", actual[0], actual[1])
+                Logger.info(f"App: Resolução pedida {resolution}, obtida {actual}")
+
+        # Frame novo sinalizado pelo provider: captura só lê quando há um
+        self._new_frame = False
+        self._frame_events = core_camera is not None
+        if self._frame_events:
+            core_camera.bind(on_texture=self._on_camera_frame)
+
+        # No Android os frames NV21 vêm direto do preview da câmera: sem
+        # leitura GL, mas também sem o Fbo para espelhar/rotacionar, então
+        # a orientação volta para o pipeline da CPU
+        if IS_ANDROID and hasattr(core_camera, 'grab_frame'):
+            self._nv21_camera = core_camera
+        else:
+            self._nv21_camera = None
+        self._orient_on_gpu = self._nv21_camera is None
+
         # Display para mostrar frame processado
         self.display_image.size_hint = (1, 1)
         
@@ -588,20 +855,23 @@ class PotholeDetectorLayout(BoxLayout):
         self.camera_container.add_widget(self.display_image, index=1)
         
         # Agendar início com delay para estabilizar
-        def start_camera(*_):
-            try:
-                self.camera.play = True
-                self._log(f"Câmera iniciada: {resolution[0]}x{resolution[1]}", "OK")
-                self._log("Visualização sincronizada com processamento", "OK")
-                self._update_status("Monitorando pista...")
-                self.permission_btn.opacity = 0
-                self.permission_btn.disabled = True
-                self._start_processing()
-            except Exception as e:
-                self._log(f"Erro ao iniciar play: {e}", "ALERT")
-                raise e
-        
-        Clock.schedule_once(start_camera, 0.5)
+        self._camera_resolution = actual if core_camera is not None else resolution
+        self._start_camera_trigger()
+
+    def _start_camera(self, *_):
+        """Liga a câmera e o processamento (agendado por _try_init_camera)."""
+        resolution = self._camera_resolution
+        try:
+            self.camera.play = True
+            self._log("Câmera iniciada: %dx%d", resolution[0], resolution[1], level="OK")
+            self._log("Visualização sincronizada com processamento", level="OK")
+            self._update_status("Monitorando pista...")
+            self.permission_btn.opacity = 0
+            self.permission_btn.disabled = True
+            self._start_processing()
+        except Exception as e:
+            self._log("Erro ao iniciar play: %s", e, level="ALERT")
+            raise e
 
     def _show_camera_error(self, message):
         """Mostra erro de câmera na interface."""
@@ -615,16 +885,31 @@ class PotholeDetectorLayout(BoxLayout):
         if self.processing_event:
             return
         # Aguardar câmera estabilizar antes de processar
-        Clock.schedule_once(self._delayed_start_processing, 1.0)
+        self._start_processing_trigger()
 
     def _delayed_start_processing(self, *_):
         """Inicia processamento após delay."""
         if self.processing_event:
             return
-        # 60 FPS para alta velocidade (100 km/h)
-        self.processing_event = Clock.schedule_interval(self._process_frame, 1/60)
-        Logger.info("App: Processamento de frames iniciado (60 FPS)")
-        self._log("Processamento iniciado (60 FPS)", "OK")
+        stopping = self._stopping_worker
+        if stopping is not None:
+            if stopping.is_alive():
+                # Worker anterior ainda dentro do detector: tenta de novo depois
+                self._start_processing_trigger()
+                return
+            self._stopping_worker = None
+        # Worker faz conversão + detecção fora da thread da UI
+        self._rebuild_pipeline()
+        self._start_worker()
+        # Captura em cadeia: cada tick agenda o próximo (ver _process_frame)
+        self._infer_latency = 0.0
+        self.processing_event = self._capture_trigger
+        self._capture_trigger.timeout = CAPTURE_MIN_INTERVAL
+        self._capture_trigger()
+        # Resultados do worker são aplicados na UI a 30 Hz
+        self._drain_event = Clock.schedule_interval(self._drain_results, 1/30)
+        Logger.info("App: Processamento de frames iniciado (até 60 FPS, no ritmo do detector)")
+        self._log("Processamento iniciado (até 60 FPS, no ritmo do detector)", level="OK")
         self.consecutive_errors = 0
 
     def _stop_processing(self):
@@ -632,10 +917,63 @@ class PotholeDetectorLayout(BoxLayout):
         if self.processing_event:
             self.processing_event.cancel()
             self.processing_event = None
-            self._log("Processamento parado", "INFO")
+            self._log("Processamento parado")
+        if self._drain_event:
+            self._drain_event.cancel()
+            self._drain_event = None
+        self._stop_worker()
+
+    def _start_worker(self):
+        """Cria a thread de processamento (se ainda não existir)."""
+        if self._worker and self._worker.is_alive():
+            return
+        # Filas novas por worker: o sentinela de parada de um worker antigo
+        # (que pode ainda não ter saído) não derruba o novo, e resultados
+        # antigos não chegam à UI depois do reinício
+        self._frame_q = queue.Queue(maxsize=1)
+        self._result_q = queue.Queue(maxsize=1)
+        self._worker = threading.Thread(
+            target=self._worker_loop, args=(self._frame_q, self._result_q), daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self):
+        """Para a thread de processamento e espera ela sair.
+
+        O detector (cv2.dnn não é thread-safe) e os buffers de trabalho são
+        compartilhados com o próximo worker, que só pode começar depois que
+        este saiu. A espera é limitada para não travar a UI; se estourar, o
+        reinício aguarda (ver _delayed_start_processing).
+        """
+        worker = self._worker
+        if worker is None:
+            return
+        self._worker = None
+        _put_latest(self._frame_q, None)
+        worker.join(timeout=WORKER_JOIN_TIMEOUT)
+        if worker.is_alive():
+            Logger.warning("App: Worker anterior ainda não terminou")
+            self._stopping_worker = worker
 
     def _process_frame(self, dt):
-        """Processa um frame da câmera."""
+        """Captura um frame e agenda a próxima captura no ritmo do detector."""
+        if not self.processing_event:
+            return
+        try:
+            self._capture_frame()
+        finally:
+            # Não lê a GPU mais rápido do que o worker consegue consumir:
+            # com o celular esquentando (inferência mais lenta) a captura
+            # desacelera junto, em vez de descartar frames lidos à toa
+            if self.processing_event:
+                self._capture_trigger.timeout = max(CAPTURE_MIN_INTERVAL, self._infer_latency)
+                self._capture_trigger()
+
+    def _on_camera_frame(self, *_):
+        """Marca que a câmera entregou um frame novo (evento on_texture)."""
+        self._new_frame = True
+
+    def _capture_frame(self):
+        """Captura um frame da câmera e entrega ao worker (thread da UI)."""
         # Verificações de segurança
         if not self.camera:
             return
@@ -644,132 +982,377 @@ class PotholeDetectorLayout(BoxLayout):
             return
             
         if not self.camera.texture:
-            if self.debug_enabled:
-                self._log("Aguardando texture da câmera...", "INFO")
+            self._log("Aguardando texture da câmera...")
             return
             
-        if not self.detector:
+        if not self.detector or cv2 is None:
+            return
+
+        # Worker ainda não pegou o frame anterior: ler outro agora seria descartado
+        if self._frame_q.full():
+            return
+
+        # Câmera não entregou frame novo desde a última leitura
+        if self._frame_events and not self._new_frame:
             return
 
         try:
-            import numpy as np
-            import cv2
-            from kivy.graphics.texture import Texture
-            
-            # Calcular FPS
-            self.frame_count += 1
-            now = datetime.now()
-            elapsed = (now - self.last_fps_time).total_seconds()
-            if elapsed >= 1.0:
-                self.current_fps = self.frame_count / elapsed
-                self.frame_count = 0
-                self.last_fps_time = now
-                if self.debug_enabled:
-                    self._log(f"FPS: {self.current_fps:.1f} | Frames OK", "INFO")
-            
             texture = self.camera.texture
             
-            # Verificar se pixels estão disponíveis
-            if texture.pixels is None:
-                return
-                
-            pixels = texture.pixels
+            nv21 = self._nv21_camera is not None
+            if nv21:
+                # Android: cópia do buffer NV21 do preview (1,5 byte/pixel),
+                # sem glReadPixels - o worker converte direto para RGBA
+                pixels = self._nv21_camera.grab_frame()
+                if pixels is None:
+                    return
+                width, height = self._nv21_camera.resolution
+                expected_size = width * height * 3 // 2
+            else:
+                # Leitura dos pixels precisa do contexto GL - fica na thread da UI.
+                # Uma única leitura por tick: o mesmo objeto serve para checar o
+                # tamanho e para o np.frombuffer (zero-copy) no worker
+                pixels, width, height = self._read_pixels(texture)
+                if pixels is None:
+                    return
+                expected_size = width * height * 4
             
             # Verificar tamanho esperado
-            expected_size = texture.height * texture.width * 4
-            if len(pixels) != expected_size:
-                if self.debug_enabled:
-                    self._log(f"Tamanho pixels incorreto: {len(pixels)} != {expected_size}", "ALERT")
+            pixels_size = len(pixels)
+            if pixels_size != expected_size:
+                self._log("Tamanho pixels incorreto: %d != %d", pixels_size, expected_size, level="ALERT")
                 return
             
-            frame = np.frombuffer(pixels, dtype=np.uint8)
-            frame = frame.reshape(texture.height, texture.width, 4)
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
-            
-            # Aplicar espelhamento horizontal se ativado
-            if self.mirror_mode:
-                frame_bgr = cv2.flip(frame_bgr, 1)  # 1 = horizontal
-            
-            # Aplicar rotação conforme configuração do usuário
-            if self.rotation_mode == 1:  # 90°
-                frame_bgr = cv2.rotate(frame_bgr, cv2.ROTATE_90_CLOCKWISE)
-            elif self.rotation_mode == 2:  # 180°
-                frame_bgr = cv2.rotate(frame_bgr, cv2.ROTATE_180)
-            elif self.rotation_mode == 3:  # 270°
-                frame_bgr = cv2.rotate(frame_bgr, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            # rotation_mode == 0: sem rotação
-            
-            # Atualizar display_image com o frame rotacionado (RGB)
-            frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-            frame_rgb = cv2.flip(frame_rgb, 0)  # Flip vertical para Kivy (origem embaixo)
-            h, w = frame_rgb.shape[:2]
-            display_texture = Texture.create(size=(w, h), colorfmt='rgb')
-            display_texture.blit_buffer(frame_rgb.tobytes(), colorfmt='rgb', bufferfmt='ubyte')
-            self.display_image.texture = display_texture
-
-            # Detectar TODOS os objetos (sem filtro)
-            all_detections = self.detector.detect(frame_bgr, return_all=True)
-            
+            # Fila de 1 posição: se o worker está ocupado, o frame antigo é descartado
+            _put_latest(self._frame_q, (pixels, width, height, nv21))
+            self._new_frame = False
+
+        except Exception as e:
+            self._on_processing_error(e)
+
+    def _worker_loop(self, frame_q, result_q):
+        """Loop da thread de processamento: conversão, rotação e detecção."""
+        while True:
+            item = frame_q.get()
+            if item is None:
+                break
+            pixels, width, height, nv21 = item
+
+            try:
+                # View zero-copy já no formato final, criada direto sobre o
+                # buffer dos bytes lidos (sem frombuffer + reshape)
+                if nv21:
+                    # Plano Y (altura linhas) seguido de VU intercalado (altura/2);
+                    # reduzido antes do cvtColor se vier maior que a leitura GPU
+                    frame = np.ndarray((height * 3 // 2, width), dtype=np.uint8, buffer=pixels)
+                    frame, width, height = self._shrink_nv21(frame, width, height)
+                    # RGBA como a leitura da GPU: o detector aceita e o GLES
+                    # recebe sem troca de canais em software no blit_buffer
+                    frame = cv2.cvtColor(frame, cv2.COLOR_YUV2RGBA_NV21,
+                                         dst=self._rgba_buffer(height, width))
+                else:
+                    # RGBA da GPU vai direto para o detector e para o preview:
+                    # nenhum cvtColor no frame inteiro
+                    frame = np.ndarray((height, width, 4), dtype=np.uint8, buffer=pixels)
+                captured = frame
+                
+                # Espelhamento + rotação já especializados (ver _rebuild_pipeline)
+                frame = self._pipeline(frame)
+
+                # Detectar TODOS os objetos (sem filtro)
+                t0 = time.perf_counter()
+                all_detections = self.detector.detect(frame, return_all=True)
+                self._infer_latency = time.perf_counter() - t0
+
+                h, w = frame.shape[:2]
+                if frame is captured and not nv21:
+                    # Bytes do Fbo são imutáveis e só deste frame: vão sem cópia
+                    display_flat = pixels
+                else:
+                    # Cópia para o display: os buffers de trabalho são reutilizados
+                    display = self._next_display_buf(frame.shape)
+                    np.copyto(display, frame)
+                    # int8 plano: formato aceito pelo blit_buffer sem passar por bytes
+                    display_flat = display.reshape(-1).view(np.int8)
+                _put_latest(result_q, (display_flat, w, h, all_detections))
+            except Exception as e:
+                _put_latest(result_q, e)
+
+    def _next_display_buf(self, shape):
+        """Próximo buffer do display (rodízio de 3, realocados só se a resolução mudar).
+
+        Um está sendo escrito pelo worker, outro pode estar na fila e o
+        terceiro sendo enviado à textura pela UI - nenhum é sobrescrito em uso.
+        Evita alocar (e zerar páginas de) um bytes novo a cada frame.
+        """
+        bufs = self._display_bufs
+        if not bufs or bufs[0].shape != shape:
+            bufs[:] = [np.empty(shape, dtype=np.uint8) for _ in range(3)]
+        self._display_idx = (self._display_idx + 1) % len(bufs)
+        return bufs[self._display_idx]
+
+    def _rebuild_pipeline(self):
+        """Monta a função de preparo do frame para a rotação/espelhamento atuais.
+
+        Só roda quando a configuração muda (rotação, espelho, detector); o
+        worker chama a função pronta, sem reavaliar os ifs a cada frame.
+        Sempre que possível as etapas são views com strides - o detector
+        copia apenas o que usa (ROI/resize) e o display copia para o seu buffer.
+        Com a orientação feita no Fbo de leitura (_orient_on_gpu) as etapas
+        da CPU só são usadas para frames que não vêm da textura.
+        """
+        # Fbo é remontado na próxima leitura com a orientação nova
+        self._readback_src = None
+        if self._orient_on_gpu:
+            # Frame já chega orientado e contíguo do Fbo
+            self._pipeline = self._proc_r0
+            return
+
+        contiguous = self.detector.requires_contiguous if self.detector else True
+
+        if self.rotation_mode == 1:  # 90°
+            rotate = self._proc_r90 if contiguous else self._view_r90
+        elif self.rotation_mode == 2:  # 180°
+            rotate = self._proc_r180
+        elif self.rotation_mode == 3:  # 270°
+            rotate = self._proc_r270 if contiguous else self._view_r270
+        else:  # sem rotação
+            rotate = self._proc_r0
+
+        steps = []
+        if self.mirror_mode:
+            steps.append(self._proc_mirror)
+        steps.append(rotate)
+        # Views precisam de cópia se o detector exige contíguo
+        # (cv2.rotate em 90°/270° já escreve em buffer contíguo)
+        is_view = self.mirror_mode or self.rotation_mode == 2
+        if contiguous and is_view and self.rotation_mode not in (1, 3):
+            steps.append(self._proc_contiguous)
+
+        if len(steps) == 1:
+            self._pipeline = steps[0]
+        else:
+            def pipeline(frame, steps=tuple(steps)):
+                for step in steps:
+                    frame = step(frame)
+                return frame
+            self._pipeline = pipeline
+
+    def _proc_r0(self, frame):
+        return frame
+
+    def _proc_r90(self, frame):
+        out = self._rot_buffer((frame.shape[1], frame.shape[0]) + frame.shape[2:])
+        return cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE, dst=out)
+
+    def _proc_r180(self, frame):
+        return frame[::-1, ::-1]
+
+    def _proc_r270(self, frame):
+        out = self._rot_buffer((frame.shape[1], frame.shape[0]) + frame.shape[2:])
+        return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE, dst=out)
+
+    def _view_r90(self, frame):
+        return np.rot90(frame, -1)
+
+    def _view_r270(self, frame):
+        return np.rot90(frame, 1)
+
+    def _proc_mirror(self, frame):
+        return frame[:, ::-1]
+
+    def _proc_contiguous(self, frame):
+        out = self._rot_buffer(frame.shape)
+        np.copyto(out, frame)
+        return out
+
+    def _shrink_nv21(self, frame, width, height):
+        """Reduz um frame NV21 (altura*3/2, largura) para no máximo READBACK_MAX_SIDE.
+
+        Decimação por fator inteiro direto nos planos Y e VU, antes da
+        conversão de cor: o cvtColor processa fator² vezes menos pixels.
+        Retorna (frame (altura*3/2, largura), largura, altura).
+        """
+        factor = -(-max(width, height) // READBACK_MAX_SIDE)
+        if factor <= 1 or width % (2 * factor) or height % (2 * factor):
+            return frame, width, height
+
+        w, h = width // factor, height // factor
+        shape = (h * 3 // 2, w)
+        if self._nv21_buf is None or self._nv21_buf.shape != shape:
+            self._nv21_buf = np.empty(shape, dtype=np.uint8)
+        out = self._nv21_buf
+
+        y_plane = frame[:height]
+        vu_plane = frame[height:].reshape(height // 2, width // 2, 2)
+        np.copyto(out[:h], y_plane[::factor, ::factor])
+        np.copyto(out[h:].reshape(h // 2, w // 2, 2), vu_plane[::factor, ::factor])
+        return out, w, h
+
+    def _rgba_buffer(self, height, width):
+        """Buffer RGBA reutilizado entre frames (realocado só se a resolução mudar)."""
+        if self._rgba_buf is None or self._rgba_buf.shape[:2] != (height, width):
+            self._rgba_buf = np.empty((height, width, 4), dtype=np.uint8)
+        return self._rgba_buf
+
+    def _rot_buffer(self, shape):
+        """Buffer reutilizado para frames rotacionados/contíguos."""
+        if self._rot_buf is None or self._rot_buf.shape != shape:
+            self._rot_buf = np.empty(shape, dtype=np.uint8)
+        return self._rot_buf
+
+    def _drain_results(self, dt):
+        """Aplica na UI o resultado mais recente do worker."""
+        try:
+            result = self._result_q.get_nowait()
+        except queue.Empty:
+            return
+
+        if isinstance(result, Exception):
+            self._on_processing_error(result)
+            return
+
+        try:
+            display_buf, w, h, all_detections = result
+
+            # Calcular FPS (frames efetivamente processados)
+            self.frame_count += 1
+            now = time.monotonic()
+            elapsed = now - self.last_fps_time
+            if elapsed >= 1.0:
+                self.current_fps = self.frame_count / elapsed
+                self.frame_count = 0
+                self.last_fps_time = now
+                self._log("FPS: %.1f | Frames OK", self.current_fps)
+
+            # Atualizar display_image com o frame rotacionado.
+            # Frames sempre em RGBA: formato que o GLES recebe nativamente, sem
+            # a troca de canais em software que o Kivy faz para 'bgr'. Origem
+            # embaixo do Kivy resolvida nas UVs (flip_vertical) - sem flip na CPU
+            display_texture = self.display_image.texture
+            if display_texture is None or display_texture.size != (w, h):
+                display_texture = Texture.create(size=(w, h), colorfmt='rgba')
+                display_texture.flip_vertical()
+                self.display_image.texture = display_texture
+            display_texture.blit_buffer(display_buf, colorfmt='rgba', bufferfmt='ubyte')
+            self.display_image.canvas.ask_update()
+
             # Resetar contador de erros após sucesso
             self.consecutive_errors = 0
             
             # Filtrar por confiança para alertas
-            high_conf_detections = [d for d in all_detections if d[4] >= self.min_confidence]
+            high_conf_detections = all_detections[all_detections[:, 4] >= self.min_confidence]
             
             # Log de debug detalhado
             if self.debug_enabled:
-                if all_detections:
-                    # Mostra TODAS as detecções no log
-                    for i, (x, y, w, h, conf) in enumerate(all_detections):
-                        level = "ALERT" if conf >= self.min_confidence else "DETECT" if conf >= 0.3 else "INFO"
-                        self._log(f"#{i+1}: {conf*100:.0f}% @ ({x:.2f},{y:.2f})", level)
+                if len(all_detections):
+                    # Mostra TODAS as detecções em uma única entrada de log
+                    # (um add_log por frame, não um por detecção)
+                    lines = "\n".join(
+                        f"#{i+1}: {conf*100:.0f}% @ ({x:.2f},{y:.2f})"
+                        for i, (x, y, _, _, conf) in enumerate(all_detections)
+                    )
+                    # Detecções vêm ordenadas por confiança: a primeira define o nível
+                    top_conf = all_detections[0, 4]
+                    level = "ALERT" if top_conf >= self.min_confidence else "DETECT" if top_conf >= 0.3 else "INFO"
+                    self._log(lines, level=level)
                 elif self.frame_count % 10 == 0:  # Log periódico quando vazio
-                    self._log("Analisando... nenhuma detecção", "INFO")
+                    self._log("Analisando... nenhuma detecção")
 
             # Mostrar todas as detecções visualmente (overlay filtra por show_all)
-            if all_detections:
+            if len(all_detections):
                 self.alert_overlay.show_detections(all_detections, self.display_image)
                 
                 # Alertar apenas para detecções de alta confiança
-                if high_conf_detections:
+                if len(high_conf_detections):
                     self._handle_detections(high_conf_detections)
             else:
                 self.alert_overlay.clear()
-                if "Buraco" in self.status_label.text or "BURACO" in self.status_label.text:
+                if self._alert_active:
                     self._update_status("Monitorando pista...")
 
         except Exception as e:
-            self.consecutive_errors = getattr(self, 'consecutive_errors', 0) + 1
-            error_msg = str(e)[:60]
-            Logger.error(f"App: Erro no processamento: {e}")
-            
-            if self.debug_enabled:
-                self._log(f"Erro #{self.consecutive_errors}: {error_msg}", "ALERT")
-            
-            # Se muitos erros consecutivos, parar e reiniciar
-            if self.consecutive_errors >= 10:
-                self._log("Muitos erros! Reiniciando câmera...", "ALERT")
-                self._stop_processing()
-                Clock.schedule_once(lambda *_: self._init_camera(), 2.0)
+            self._on_processing_error(e)
+
+    def _on_processing_error(self, e):
+        """Conta erros consecutivos e reinicia a câmera se necessário."""
+        self.consecutive_errors = getattr(self, 'consecutive_errors', 0) + 1
+        error_msg = str(e)[:60]
+        Logger.error(f"App: Erro no processamento: {e}")
+        
+        self._log("Erro #%d: %s", self.consecutive_errors, error_msg, level="ALERT")
+        
+        # Se muitos erros consecutivos, parar e reiniciar
+        if self.consecutive_errors >= 10:
+            self._log("Muitos erros! Reiniciando câmera...", level="ALERT")
+            self._stop_processing()
+            self._reinit_camera_trigger()
+
+    def _init_camera_cb(self, *_):
+        """Callback do Clock para _init_camera (sem criar lambda a cada agendamento)."""
+        self._init_camera()
+
+    def _read_pixels(self, texture):
+        """Lê os pixels RGBA da câmera, reduzidos e orientados na GPU.
+
+        A textura é desenhada em um Fbo de no máximo READBACK_MAX_SIDE pixels
+        no lado maior, então a leitura GPU->CPU transfere menos bytes. O Fbo
+        só é recriado quando a textura da câmera ou a orientação mudam
+        (``Texture.pixels`` criaria um novo a cada chamada).
+
+        Returns:
+            Tupla (pixels, largura, altura) do frame lido
+        """
+        if self._readback_src is not texture:
+            self._setup_readback(texture)
+        fbo = self._readback_fbo
+        if self._readback_scaled:
+            fbo.draw()
+        width, height = fbo.size
+        return fbo.pixels, int(width), int(height)
+
+    def _setup_readback(self, texture):
+        """Cria o Fbo de leitura para a textura da câmera.
+
+        Redução, espelho e rotação saem do mesmo desenho na GPU: o frame
+        lido já está na orientação final, sem passadas extras na CPU.
+        """
+        tex_w, tex_h = texture.size
+        scale = min(1.0, READBACK_MAX_SIDE / max(tex_w, tex_h))
+        rotation = self.rotation_mode if self._orient_on_gpu else 0
+        mirror = self.mirror_mode and self._orient_on_gpu
+        if scale >= 1.0 and not rotation and not mirror:
+            # Já é pequena e sem orientação a aplicar: lê direto da textura
+            self._readback_fbo = Fbo(size=texture.size, texture=texture)
+            self._readback_scaled = False
+        else:
+            w, h = int(tex_w * scale), int(tex_h * scale)
+            size = (h, w) if rotation in (1, 3) else (w, h)
+            fbo = Fbo(size=size)
+            with fbo:
+                Rectangle(texture=texture, pos=(0, 0), size=size,
+                          tex_coords=_oriented_tex_coords(texture, rotation, mirror))
+            self._readback_fbo = fbo
+            self._readback_scaled = True
+        self._readback_src = texture
 
     def _handle_detections(self, detections):
         """Processa detecções de ALTA CONFIANÇA encontradas."""
-        now = datetime.now()
-        should_alert = (
-            self.last_alert_time is None or
-            (now - self.last_alert_time).total_seconds() >= self.alert_cooldown
-        )
+        # Relógio monotônico: barato e imune a ajustes de hora do sistema
+        now = time.monotonic()
+        should_alert = now - self.last_alert_time >= self.alert_cooldown
 
-        if should_alert and detections:
+        if should_alert and len(detections):
             self.last_alert_time = now
             self.detection_count += len(detections)
             self._update_counter_label()
 
-            avg_conf = sum(d[4] for d in detections) / len(detections)
+            avg_conf = float(detections[:, 4].mean())
             self._update_status(
                 f"⚠️ BURACO! ({len(detections)}x)\nConfiança: {avg_conf:.0%}",
                 warning=True
             )
+            self._alert_active = True
             
             self._vibrate()
 
@@ -778,12 +1361,12 @@ class PotholeDetectorLayout(BoxLayout):
         if not IS_ANDROID or not PythonActivity:
             return
         try:
-            from jnius import autoclass
-            Vibrator = autoclass('android.os.Vibrator')
-            activity = PythonActivity.mActivity
-            vibrator = activity.getSystemService(Context.VIBRATOR_SERVICE)
-            if vibrator:
-                vibrator.vibrate(500)
+            # Serviço buscado uma vez: cada alerta é só uma chamada JNI
+            if self._vibrator is None:
+                activity = PythonActivity.mActivity
+                self._vibrator = activity.getSystemService(Context.VIBRATOR_SERVICE)
+            if self._vibrator:
+                self._vibrator.vibrate(500)
         except Exception as e:
             Logger.warning(f"App: Vibração falhou: {e}")
 
@@ -796,6 +1379,11 @@ class PotholeDetectorLayout(BoxLayout):
         else:
             color = (0.4, 1, 0.4, 1)
 
+        # Qualquer outro status substitui o alerta (_handle_detections religa)
+        self._alert_active = False
+        if (text, color) == self._last_status:
+            return
+        self._last_status = (text, color)
         self.status_label.text = f"[b]Detector de Buracos[/b]\n{text}"
         self.status_label.color = color
 
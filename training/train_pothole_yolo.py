@@ -1,100 +1,191 @@
 # 🚗 Treinamento YOLO para Detecção de Buracos
 # =============================================
-# Execute este notebook no Google Colab com GPU
+# Execute no Google Colab com GPU:
+#   python train_pothole_yolo.py [--test-image caminho/para/imagem.jpg]
+#
+# Cada etapa é uma função; nada roda ao importar este módulo.
 
 # ============================================
 # 1. INSTALAR DEPENDÊNCIAS
 # ============================================
 
-# !pip install ultralytics roboflow
+# !pip install ultralytics roboflow onnxruntime
+
+import argparse
+import glob
+
+# Crie uma conta gratuita no Roboflow e obtenha sua API key
+ROBOFLOW_API_KEY = "SUA_API_KEY_AQUI"  # Substitua pela sua API key
 
 # ============================================
 # 2. BAIXAR DATASET DO ROBOFLOW
 # ============================================
 
-from roboflow import Roboflow
-
-# Dataset recomendado: 11.763 imagens de buracos
-# Acesse: https://universe.roboflow.com/project-saocp/pothole-fy5oo
-# Crie uma conta gratuita e obtenha sua API key
+def download_dataset():
+    """Baixa o dataset de buracos no formato YOLO."""
+    from roboflow import Roboflow
 
-rf = Roboflow(api_key="SUA_API_KEY_AQUI")  # Substitua pela sua API key
-project = rf.workspace("project-saocp").project("pothole-fy5oo")
-dataset = project.version(1).download("yolov8")
+    # Dataset recomendado: 11.763 imagens de buracos
+    # Acesse: https://universe.roboflow.com/project-saocp/pothole-fy5oo
+    rf = Roboflow(api_key=ROBOFLOW_API_KEY)
+    project = rf.workspace("project-saocp").project("pothole-fy5oo")
+    return project.version(1).download("yolov8")
 
 # ============================================
 # 3. TREINAR MODELO YOLO11
 # ============================================
 
-from ultralytics import YOLO
-
-# Usar YOLO11 nano para dispositivos móveis (mais leve e rápido)
-model = YOLO("yolo11n.pt")  # ou yolo11s.pt para mais precisão
-
-# Treinar
-results = model.train(
-    data=f"{dataset.location}/data.yaml",
-    epochs=100,           # Mais épocas = melhor precisão
-    imgsz=640,            # Tamanho da imagem
-    batch=16,             # Ajuste conforme memória GPU
-    device=0,             # GPU
-    patience=20,          # Early stopping
-    save=True,
-    project="pothole_detection",
-    name="yolo11n_pothole",
-    
-    # Augmentações para melhor generalização
-    augment=True,
-    hsv_h=0.015,
-    hsv_s=0.7,
-    hsv_v=0.4,
-    degrees=10,
-    translate=0.1,
-    scale=0.5,
-    fliplr=0.5,
-    mosaic=1.0,
-)
+def train(dataset):
+    """Treina o YOLO11 nano no dataset e retorna o modelo."""
+    from ultralytics import YOLO
+
+    # Usar YOLO11 nano para dispositivos móveis (mais leve e rápido)
+    model = YOLO("yolo11n.pt")  # ou yolo11s.pt para mais precisão
+
+    # Treinar
+    model.train(
+        data=f"{dataset.location}/data.yaml",
+        epochs=100,           # Mais épocas = melhor precisão
+        imgsz=640,            # Tamanho da imagem
+        batch=16,             # Ajuste conforme memória GPU
+        device=0,             # GPU
+        patience=20,          # Early stopping
+        save=True,
+        project="pothole_detection",
+        name="yolo11n_pothole",
+
+        # Augmentações para melhor generalização
+        augment=True,
+        hsv_h=0.015,
+        hsv_s=0.7,
+        hsv_v=0.4,
+        degrees=10,
+        translate=0.1,
+        scale=0.5,
+        fliplr=0.5,
+        mosaic=1.0,
+    )
+    return model
 
 # ============================================
 # 4. VALIDAR MODELO
 # ============================================
 
-metrics = model.val()
-print(f"\n📊 Resultados da Validação:")
-print(f"   mAP50: {metrics.box.map50:.3f}")
-print(f"   mAP50-95: {metrics.box.map:.3f}")
-print(f"   Precisão: {metrics.box.p[0]:.3f}")
-print(f"   Recall: {metrics.box.r[0]:.3f}")
+def validate(model):
+    """Mostra as métricas de validação."""
+    metrics = model.val()
+    print(f"\n📊 Resultados da Validação:")
+    print(f"   mAP50: {metrics.box.map50:.3f}")
+    print(f"   mAP50-95: {metrics.box.map:.3f}")
+    print(f"   Precisão: {metrics.box.p[0]:.3f}")
+    print(f"   Recall: {metrics.box.r[0]:.3f}")
+    return metrics
 
 # ============================================
 # 5. EXPORTAR PARA ONNX (Android)
 # ============================================
 
-# Exportar para ONNX (compatível com OpenCV no Android)
-model.export(
-    format="onnx",
-    imgsz=320,          # Menor para dispositivo móvel
-    simplify=True,      # Simplificar grafo
-    opset=12,           # Versão ONNX compatível
-    dynamic=False,      # Tamanho fixo para melhor performance
-)
+def export_onnx(model):
+    """Exporta para ONNX (compatível com OpenCV no Android) e retorna o caminho."""
+    onnx_path = model.export(
+        format="onnx",
+        imgsz=320,          # Menor para dispositivo móvel
+        simplify=True,      # Simplificar grafo
+        opset=13,           # Mínimo para o QDQ por canal da quantização INT8
+        dynamic=False,      # Tamanho fixo para melhor performance
+    )
+
+    print("\n✅ Modelo exportado para ONNX!")
+    print(f"   Arquivo: {onnx_path}")
+    print("\n📱 Próximo passo: Copie o arquivo .onnx para o projeto Android")
+    return onnx_path
+
+# ============================================
+# 5.1 QUANTIZAR PARA INT8 (Android)
+# ============================================
 
-print("\n✅ Modelo exportado para ONNX!")
-print("   Arquivo: pothole_detection/yolo11n_pothole/weights/best.onnx")
-print("\n📱 Próximo passo: Copie o arquivo .onnx para o projeto Android")
+# Quantização estática (FP32 -> INT8): modelo ~4x menor e inferência mais
+# rápida no celular. O formato QDQ é lido pelo OpenCV DNN como o FP32.
+# Dependências importadas aqui: as outras etapas não precisam do onnxruntime.
+
+def quantize_int8(onnx_path, dataset):
+    """Gera <modelo>_int8.onnx calibrado com imagens de validação."""
+    import cv2
+    import numpy as np
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    )
+
+    class RoadFrameReader(CalibrationDataReader):
+        """Alimenta a calibração com ~100 imagens reais de pista."""
+
+        def __init__(self, image_paths, input_name, size=320):
+            self._paths = iter(image_paths)
+            self._input_name = input_name
+            self._size = size
+
+        def get_next(self):
+            for path in self._paths:
+                img = cv2.imread(path)
+                if img is None:
+                    continue
+                # Mesmo pré-processamento do app (detector_yolo.py)
+                blob = cv2.dnn.blobFromImage(
+                    img, scalefactor=1/255.0, size=(self._size, self._size),
+                    mean=(0, 0, 0), swapRB=True, crop=False
+                )
+                return {self._input_name: blob.astype(np.float32)}
+            return None
+
+    input_name = ort.InferenceSession(onnx_path).get_inputs()[0].name
+    calib_images = sorted(glob.glob(f"{dataset.location}/valid/images/*.jpg"))[:100]
+
+    int8_path = onnx_path.replace(".onnx", "_int8.onnx")
+    quantize_static(
+        onnx_path,
+        int8_path,
+        RoadFrameReader(calib_images, input_name),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,   # QDQ por eixo: exige opset >= 13 (ver export_onnx)
+    )
+
+    print(f"\n✅ Modelo INT8 exportado: {int8_path}")
+    print("   Copie junto do FP32 com o sufixo _int8 (ex: pothole_detector_int8.onnx)")
+    return int8_path
 
 # ============================================
 # 6. TESTE RÁPIDO
 # ============================================
 
-# Testar em uma imagem
-test_results = model.predict(
-    source="path/to/test/image.jpg",
-    conf=0.5,           # Confiança mínima
-    save=True,
-)
-
-for r in test_results:
-    print(f"Detecções: {len(r.boxes)}")
-    for box in r.boxes:
-        print(f"  - Confiança: {box.conf[0]:.2%}")
+def smoke_test(model, image_path):
+    """Roda o modelo em uma imagem e lista as detecções."""
+    test_results = model.predict(
+        source=image_path,
+        conf=0.5,           # Confiança mínima
+        save=True,
+    )
+
+    for r in test_results:
+        print(f"Detecções: {len(r.boxes)}")
+        for box in r.boxes:
+            print(f"  - Confiança: {box.conf[0]:.2%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treina e exporta o detector de buracos")
+    parser.add_argument(
+        "--test-image",
+        help="Imagem para o teste rápido após o treino (opcional)",
+    )
+    args = parser.parse_args()
+
+    dataset = download_dataset()
+    model = train(dataset)
+    validate(model)
+    onnx_path = export_onnx(model)
+    quantize_int8(onnx_path, dataset)
+    if args.test_image:
+        smoke_test(model, args.test_image)